@@ -156,6 +156,7 @@ chown -R $SUDO_USER:$SUDO_USER /var/www/tirtha/
 # Run some config commands as the user (not root)
 sudo -u $SUDO_USER bash - <<EOF
   source ./venv/bin/activate
+  python ./tirtha_bk/manage.py upgrade_schema  # NOTE: Must run before makemigrations - See tirtha_bk/tirtha/upgrades.py
   python ./tirtha_bk/manage.py makemigrations tirtha
   python ./tirtha_bk/manage.py collectstatic --no-input
   python ./tirtha_bk/manage.py migrate
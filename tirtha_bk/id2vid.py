@@ -16,11 +16,11 @@ from tirtha.models import Mesh
 
 def _get_mesh_details(meshID: str) -> dict:
     try:
-        mesh = Mesh.objects.get(ID=meshID)
+        mesh = Mesh.objects.get(slug=meshID)
         return {
-            "ID": mesh.ID,
+            "ID": mesh.slug,
             "verbose_id": mesh.verbose_id,
-            "status": mesh.status,
+            "status": mesh.get_status_display(),
             "completed": mesh.completed,
             "updated_at": mesh.updated_at.astimezone().strftime(
                 "%d %b %Y, %H:%M:%S %Z"
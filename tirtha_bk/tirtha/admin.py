@@ -51,8 +51,8 @@ class ContributionInlineContributor(ContributionsInline):
 
 class RunInlineMesh(admin.TabularInline):
     model = Run
-    readonly_fields = ("ID", "ark", "status", "started_at", "ended_at")
-    fields = ("ID", "ark", "status", "started_at", "ended_at")
+    readonly_fields = ("slug", "ark", "status", "started_at", "ended_at")
+    fields = ("slug", "ark", "status", "started_at", "ended_at")
     extra = 0
     max_num = 0
     can_delete = False
@@ -151,7 +151,7 @@ class MeshAdmin(admin.ModelAdmin):
             "Mesh Details",
             {
                 "fields": (
-                    ("ID", "verbose_id"),
+                    ("slug", "verbose_id"),
                     ("created_at", "updated_at", "reconstructed_at"),
                     ("status", "completed", "hidden"),
                     ("name", "country", "state", "district"),
@@ -171,7 +171,7 @@ class MeshAdmin(admin.ModelAdmin):
         ),
     )
     readonly_fields = (
-        "ID",
+        "slug",
         "verbose_id",
         "created_at",
         "updated_at",
@@ -185,7 +185,7 @@ class MeshAdmin(admin.ModelAdmin):
         "hidden",
     )
     list_display = (
-        "ID",
+        "slug",
         "mesh_id_verbose",
         "name",
         "reconstructed_at",
@@ -413,6 +413,7 @@ class ContributionAdmin(admin.ModelAdmin):
         "images_good_count",
         "processed",
     )
+    list_select_related = ("mesh", "contributor")
     list_per_page = 50
     # inlines = [
     #     ImageInlineContribution,
@@ -575,7 +576,7 @@ class RunAdmin(admin.ModelAdmin):
     image_count.short_description = "Image Count"
 
     readonly_fields = (
-        "ID",
+        "slug",
         "ark",
         "mesh_id_verbose",
         "started_at",
@@ -589,7 +590,7 @@ class RunAdmin(admin.ModelAdmin):
             "Run Details",
             {
                 "fields": (
-                    ("ID"),
+                    ("slug"),
                     ("ark"),
                     ("mesh_id_verbose"),
                     ("status"),
@@ -607,13 +608,14 @@ class RunAdmin(admin.ModelAdmin):
     )
     list_filter = ("status",)
     list_display = (
-        "ID",
+        "slug",
         "mesh_id_verbose",
         "image_count",
         "status",
         "started_at",
         "ark",
     )
+    list_select_related = ("mesh", "ark")
     list_per_page = 50
     inlines = [
         ContributorInlineRun
@@ -668,4 +670,5 @@ class ARKAdmin(admin.ModelAdmin):
         ),
     )
     list_display = ("ark", "mesh_id_verbose", "get_run", "created_at", "image_count")
+    list_select_related = ("run__mesh",)
     list_per_page = 50
@@ -0,0 +1,61 @@
+"""
+Writes migrations for the upgrades in `tirtha/upgrades.py` that an existing database needs
+
+"""
+from importlib import import_module
+from pathlib import Path
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db.migrations.autodetector import MigrationAutodetector
+from django.db.migrations.loader import MigrationLoader
+
+from tirtha.upgrades import UPGRADES
+
+MIGRATION_TEMPLATE = """# Generated by `manage.py upgrade_schema`. See `tirtha/upgrades.py`.
+from django.db import migrations
+
+from tirtha import upgrades
+
+
+class Migration(migrations.Migration):
+    dependencies = [("tirtha", "{leaf}")]
+
+    operations = upgrades.{operations}()
+"""
+
+
+class Command(BaseCommand):
+    help = (
+        "Writes migrations for the upgrades in `tirtha/upgrades.py` that `makemigrations` cannot "
+        "generate. Run before `makemigrations`. Does nothing on fresh or up-to-date installs."
+    )
+
+    def handle(self, *args, **options):
+        loader = MigrationLoader(None, ignore_no_migrations=True)
+        leaves = loader.graph.leaf_nodes("tirtha")
+        if not leaves:
+            self.stdout.write("No existing migrations for tirtha. Nothing to upgrade.")
+            return
+        if len(leaves) > 1:
+            raise CommandError(
+                f"Conflicting migrations for tirtha: {[name for _, name in leaves]}. "
+                "Run `makemigrations --merge` first."
+            )
+
+        state = loader.project_state(leaves[0])
+        pending = [name for name, check in UPGRADES if check(state)]
+        if not pending:
+            self.stdout.write("tirtha is up to date. Nothing to upgrade.")
+            return
+
+        # One migration per upgrade, so that each can be reversed (where possible) on its own
+        leaf = leaves[0][1]
+        module_name, _ = loader.migrations_module("tirtha")
+        migrations_dir = Path(import_module(module_name).__file__).parent
+        for name in pending:
+            number = (MigrationAutodetector.parse_number(leaf) or 0) + 1
+            path = migrations_dir / f"{number:04d}_upgrade_{name}.py"
+            path.write_text(MIGRATION_TEMPLATE.format(leaf=leaf, operations=name))
+            self.stdout.write(self.style.SUCCESS(f"Wrote {path}."))
+            leaf = path.stem
+        self.stdout.write("Now run `makemigrations` & `migrate`.")
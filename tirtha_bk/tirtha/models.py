@@ -2,12 +2,24 @@ import os
 import uuid
 from datetime import datetime
 
-from django.db import models
-from PIL import Image as PILImage
-from PIL import ImageOps
+from django.db import models, transaction
+from django.db.models.functions import Concat
 from shortuuid.django_fields import ShortUUIDField
 
 
+class MeshStatus(models.IntegerChoices):
+    PENDING = 0, "Pending"
+    PROCESSING = 1, "Processing"
+    LIVE = 2, "Live"
+    ERROR = 3, "Error"
+
+
+class RunStatus(models.IntegerChoices):
+    PROCESSING = 0, "Processing"
+    ERROR = 1, "Error"
+    ARCHIVED = 2, "Archived"
+
+
 def set_preview(obj, filename):
     """
     Used as `poster` image for `<model-viewer>`.
@@ -15,10 +27,7 @@ def set_preview(obj, filename):
     FIXME: LATE_EXP: Auto-stage the Preview when a reconstruction is available.
 
     """
-    upload_to = f"models/{obj.ID}"
-    filename = f"{obj.ID}_prev.png"
-
-    return os.path.join(upload_to, filename)
+    return f"models/{obj.slug}/{obj.slug}_prev.png"
 
 
 def set_thumbnail(obj, filename):
@@ -26,17 +35,32 @@ def set_thumbnail(obj, filename):
     Used for the list in the nav.
 
     """
-    upload_to = f"models/{obj.ID}"
-    filename = f"{obj.ID}_thumb.png"
+    return f"models/{obj.slug}/{obj.slug}_thumb.png"
+
 
-    return os.path.join(upload_to, filename)
+class MeshQuerySet(models.QuerySet):
+    def with_contributions(self):
+        """
+        Prefetches contributions from non-banned contributors, along with their `good` images.
+        Accessing `mesh.contributions` & `contribution.images` then takes 3 queries in total.
+
+        """
+        return self.prefetch_related(
+            models.Prefetch(
+                "contributions",
+                queryset=Contribution.objects.filter(contributor__banned=False),
+            ),
+            models.Prefetch(
+                "contributions__images", queryset=Image.objects.filter(label="good")
+            ),
+        )
 
 
 class Mesh(models.Model):
-    # Short for ease of use
-    ID = ShortUUIDField(
-        primary_key=True, length=16, max_length=16, verbose_name="Mesh ID"
-    )
+    # NOTE: Integer PK keeps FKs, joins & indexes narrow.
+    # The short UUID (for ease of use) is used in URLs, paths & logs.
+    id = models.BigAutoField(primary_key=True)
+    slug = ShortUUIDField(length=16, max_length=16, unique=True, verbose_name="Mesh ID")
 
     # Metadata
     name = models.CharField(max_length=200, blank=False)
@@ -64,15 +88,13 @@ class Mesh(models.Model):
         default="<auto-generated using country, state & district>",
         verbose_name="Verbose ID",
     )
+    verbose_id_fields = ("country", "state", "district", "name")
     # Multiple choices for status: [Pending, Processing, Live, Error]
-    status_options = [
-        ("Pending", "Pending"),
-        ("Processing", "Processing"),
-        ("Live", "Live"),
-        ("Error", "Error"),
-    ]
-    status = models.CharField(
-        max_length=50, blank=False, choices=status_options, default="Pending"
+    status = models.PositiveSmallIntegerField(
+        blank=False,
+        choices=MeshStatus.choices,
+        default=MeshStatus.PENDING,
+        db_index=True,
     )
 
     # Whether the mesh is accepting images any more
@@ -80,7 +102,7 @@ class Mesh(models.Model):
     # Whether to hide the model from the frontend
     hidden = models.BooleanField(default=False, verbose_name="Hidden")
 
-    # NOTE: Directory structure: [S_DIR] = STATIC_ROOT / models | [M_DIR] = MEDIA_ROOT / models | [ID] = Mesh ID
+    # NOTE: Directory structure: [S_DIR] = STATIC_ROOT / models | [M_DIR] = MEDIA_ROOT / models | [ID] = Mesh ID (slug)
     # [M_DIR]/[ID]/images/ <- Images are uploaded here by default
     # [M_DIR]/[ID]_thumb.[image ext] file - Thumbnail <- Shown in list
     # [M_DIR]/[ID]_prev.[image ext] file - Preview <- Shown in viewer
@@ -118,61 +140,66 @@ class Mesh(models.Model):
         "Last reconstructed at", blank=True, null=True
     )
 
+    objects = MeshQuerySet.as_manager()
+
     class Meta:
         ordering = ["-updated_at"]
+        indexes = [
+            models.Index(fields=["-updated_at"]),
+            models.Index(fields=["hidden", "-updated_at"]),
+            # Partial index - Only covers meshes waiting to be processed
+            models.Index(
+                fields=["status"],
+                condition=models.Q(status=MeshStatus.PENDING),
+                name="mesh_pending_idx",
+            ),
+        ]
         verbose_name_plural = "Meshes"
 
     def __str__(self):
         return self.verbose_id
 
     def __repr__(self):
-        return f"""
-                Mesh(
-                    {self.ID},
-                    {self.name},
-                    {self.description},
-                    {self.created_at},
-                    {self.updated_at},
-                    {self.reconstructed_at},
-                    {self.status},
-                    {self.completed},
-                    {self.hidden}
-                )
-                """
+        return f"<Mesh {self.slug} {self.get_status_display()}>"
+
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        # Snapshot of the values as loaded from the DB - Used to detect changes in `save()`
+        instance._loaded_values = dict(zip(field_names, values))
+        return instance
 
     def save(self, *args, **kwargs):
-        self.verbose_id = (
-            self.country + "__" + self.state + "__" + self.district + "__" + self.name
-        ).replace(" ", "_")
+        loaded_values = getattr(self, "_loaded_values", {})
+
+        # Rebuild verbose_id only if any of its components changed
+        verbose_id_parts = [self.country, self.state, self.district, self.name]
+        if self._state.adding or verbose_id_parts != [
+            loaded_values.get(field) for field in self.verbose_id_fields
+        ]:
+            self.verbose_id = "__".join(verbose_id_parts).replace(" ", "_")
+
+        # NOTE: Checked before saving, since saving commits the file & clears `_state.adding`
+        loaded_thumbnail = loaded_values.get("thumbnail", self.thumbnail.name)
+        thumbnail_changed = (
+            self._state.adding
+            or not self.thumbnail._committed
+            or self.thumbnail.name != loaded_thumbnail
+        )
         super().save(*args, **kwargs)
 
-        # Resizes & compresses preview image
-        if self.thumbnail:
-            # Load the uploaded image
-            image = PILImage.open(self.thumbnail.path)
-            image = ImageOps.exif_transpose(image)
-            aspect_ratio = image.width / image.height
-            new_width = image.width
-            new_height = image.height
-            min_dimension = 400
-
-            if image.width >= min_dimension and image.height >= min_dimension:
-                # Preserve aspect ratio
-                if aspect_ratio > 1:  # Landscape
-                    new_width = max(min_dimension, int(min_dimension * aspect_ratio))
-                    new_height = min_dimension
-                else:  # Portrait
-                    new_width = min_dimension
-                    new_height = max(min_dimension, int(min_dimension / aspect_ratio))
-
-            # Resize
-            resized_image = image.resize((new_width, new_height))
+        # Resizes & compresses thumbnail image (async) - Once the mesh is committed to the DB
+        if self.thumbnail and thumbnail_changed:
+            from .tasks import resize_thumbnail
 
-            # Save the resized image at 60% quality
-            resized_image.save(self.thumbnail.path, quality=60)
-            resized_image.close()
+            mesh_slug = self.slug
+            transaction.on_commit(lambda: resize_thumbnail.delay(mesh_slug))
 
-            super().save(*args, **kwargs)
+        self._loaded_values = {
+            **loaded_values,
+            **dict(zip(self.verbose_id_fields, verbose_id_parts)),
+            "thumbnail": self.thumbnail.name,
+        }
 
 
 class Contributor(models.Model):
@@ -196,23 +223,24 @@ class Contributor(models.Model):
 
     class Meta:
         ordering = ["name"]
+        indexes = [models.Index(fields=["name"])]
         verbose_name_plural = "Contributors"
 
     def __str__(self):
         return self.email
 
     def __repr__(self):
-        return f"""
-                Contributor(
-                    {self.ID},
-                    {self.name},
-                    {self.email},
-                    {self.created_at},
-                    {self.updated_at},
-                    {self.banned},
-                    {self.ban_reason}
-                )
-                """
+        return f"<Contributor {self.ID}>"
+
+
+class ContributionManager(models.Manager):
+    """
+    Fetches `mesh` & `contributor` along with each `Contribution` (used by views & admin).
+
+    """
+
+    def get_queryset(self):
+        return super().get_queryset().select_related("mesh", "contributor")
 
 
 class Contribution(models.Model):
@@ -239,31 +267,26 @@ class Contribution(models.Model):
         blank=True, null=True, verbose_name="Processed Timestamp"
     )
 
+    objects = ContributionManager()
+
     class Meta:
         ordering = ["-contributed_at"]
+        indexes = [models.Index(fields=["-contributed_at"])]
         verbose_name_plural = "Contributions"
 
     def __str__(self):
         return f"{self.ID}"
 
     def __repr__(self):
-        return f"""
-                Contribution(
-                    {self.ID},
-                    {self.mesh},
-                    {self.contributor},
-                    {self.contributed_at},
-                    {self.processed},
-                    {self.processed_at}
-                )
-                """
+        return f"<Contribution {self.ID} processed={self.processed}>"
 
 
 def set_image(obj, filename):
-    upload_to = f"models/{obj.contribution.mesh.ID}/images"
-    filename = f"{str(obj.ID)}.{filename.split('.')[-1].lower()}"
+    # NOTE: `obj.contribution` (& its `mesh`) should be attached as instances, not IDs,
+    # else each call costs 2 queries. See `views.upload()`.
+    ext = os.path.splitext(filename)[1].lower()
 
-    return os.path.join(upload_to, filename)
+    return f"models/{obj.contribution.mesh.slug}/images/{obj.ID}{ext}"
 
 
 class Image(models.Model):
@@ -281,21 +304,22 @@ class Image(models.Model):
 
     class Meta:
         ordering = ["-created_at"]
+        indexes = [models.Index(fields=["-created_at"])]
         verbose_name_plural = "Images"
 
     def __str__(self):
         return f"{self.ID}"
 
     def __repr__(self):
-        return f"""
-                Image(
-                    {self.ID},
-                    {self.contribution},
-                    {self.image.url},
-                    {self.label},
-                    {self.remark}
-                )
-                """
+        return f"<Image {self.ID} label={self.label!r}>"
+
+
+# Default commitment statement for ARKs - Also used as the `notice` in ARK metadata
+ARK_COMMITMENT = (
+    "This ARK was generated & is managed by Project Tirtha (https://smlab.niser.ac.in/project/tirtha/). "
+    "We are committed to maintaining this ARK as per our Terms of Use (https://smlab.niser.ac.in/project/tirtha/#terms) "
+    "and Privacy Policy (https://smlab.niser.ac.in/project/tirtha/#privacy)."
+)
 
 
 class ARK(models.Model):
@@ -323,23 +347,30 @@ class ARK(models.Model):
     metadata = models.JSONField(
         blank=False, verbose_name="Metadata"
     )  # CHECK: if this can be used as API meanwhile FIXME: LATE_EXP:
-    def_commit = (
-        "This ARK was generated & is managed by Project Tirtha (https://smlab.niser.ac.in/project/tirtha/). "
-        + "We are committed to maintaining this ARK as per our Terms of Use (https://smlab.niser.ac.in/project/tirtha/#terms) "
-        + "and Privacy Policy (https://smlab.niser.ac.in/project/tirtha/#privacy)."
-    )
     commitment = models.TextField(
-        default=def_commit.strip(), blank=False, verbose_name="Commitment"
+        default=ARK_COMMITMENT, blank=False, verbose_name="Commitment"
     )
 
     class Meta:
         ordering = ["-created_at"]
+        indexes = [models.Index(fields=["-created_at"])]
+        constraints = [
+            models.CheckConstraint(
+                check=models.Q(shoulder__startswith="/"), name="ark_shoulder_slash"
+            ),
+            models.CheckConstraint(
+                check=models.Q(ark=Concat("naan", "shoulder", "assigned_name")),
+                name="ark_matches_components",
+            ),
+        ]
         verbose_name_plural = "ARKs"
 
     def __str__(self):
         return f"ark:/{self.ark}"
 
     def save(self, *args, **kwargs):
+        # NOTE: Also enforced by the DB (see `Meta.constraints`). Checked here too, since
+        # `MeshOps.run_ark()` treats an `IntegrityError` as an ARK collision & retries.
         if not self.shoulder.startswith("/"):
             raise ValueError(f"Shoulder {self.shoulder} must start with a /.")
 
@@ -349,10 +380,19 @@ class ARK(models.Model):
         super().save(*args, **kwargs)
 
 
+class RunManager(models.Manager):
+    """
+    Fetches `mesh` & `ark` along with each `Run` (used by views & admin).
+
+    """
+
+    def get_queryset(self):
+        return super().get_queryset().select_related("mesh", "ark")
+
+
 class Run(models.Model):
-    ID = ShortUUIDField(
-        primary_key=True, length=16, max_length=16, verbose_name="Run ID"
-    )
+    id = models.BigAutoField(primary_key=True)
+    slug = ShortUUIDField(length=16, max_length=16, unique=True, verbose_name="Run ID")
     mesh = models.ForeignKey(
         Mesh, on_delete=models.CASCADE, verbose_name="Mesh ID", related_name="runs"
     )
@@ -371,14 +411,12 @@ class Run(models.Model):
         max_length=200, blank=True, verbose_name="Run directory"
     )
 
-    # Status of the run
-    status_options = [
-        ("Processing", "Processing"),
-        ("Error", "Error"),
-        ("Archived", "Archived"),
-    ]
-    status = models.CharField(
-        max_length=50, blank=False, choices=status_options, default="Processing"
+    # Status of the run: [Processing, Error, Archived]
+    status = models.PositiveSmallIntegerField(
+        blank=False,
+        choices=RunStatus.choices,
+        default=RunStatus.PROCESSING,
+        db_index=True,
     )
 
     # Metadata
@@ -398,28 +436,23 @@ class Run(models.Model):
         default=0, null=True, verbose_name="Rotation about Z-axis"
     )
 
+    objects = RunManager()
+
     class Meta:
         ordering = ["-started_at"]
+        indexes = [models.Index(fields=["-started_at"])]
         verbose_name_plural = "Runs"
 
     def __str__(self):
-        return f"{self.ID}"
+        return f"{self.slug}"
 
     def __repr__(self):
-        return f"""
-                Run(
-                    {self.ID},
-                    {self.mesh},
-                    {self.started_at},
-                    {self.ended_at},
-                    {self.directory},
-                    {self.status},
-                    {self.ark.url}
-                )
-                """
+        return f"<Run {self.slug} {self.get_status_display()}>"
 
     def save(self, *args, **kwargs):
         super().save(*args, **kwargs)
         if not self.directory:
-            self.directory = f"{self.mesh.ID}/cache/{self.started_at.strftime('%Y-%m-%d-%H-%M-%S')}__{str(self.ID)}"
-        super().save(update_fields=["directory"])
+            ts = self.started_at
+            stamp = f"{ts.year:04d}-{ts.month:02d}-{ts.day:02d}-{ts.hour:02d}-{ts.minute:02d}-{ts.second:02d}"
+            self.directory = f"{self.mesh.slug}/cache/{stamp}__{self.slug}"
+            super().save(update_fields=["directory"])
@@ -6,7 +6,7 @@ from django.db.models.signals import post_delete, post_migrate, post_save, pre_s
 from django.dispatch import receiver
 
 # Local imports
-from .models import Contribution, Contributor, Image, Mesh, Run
+from .models import Contribution, Contributor, Image, Mesh, Run, RunStatus
 
 STATIC = Path(settings.STATIC_ROOT)
 MEDIA = Path(settings.MEDIA_ROOT)
@@ -56,7 +56,7 @@ def post_migrate_create_defaults(sender, **kwargs):
 
         # Create default mesh - shown on homepage
         mesh, _ = Mesh.objects.get_or_create(
-            ID=mesh_ID, name=DEFAULT_MESH_NAME, hidden=True
+            slug=mesh_ID, name=DEFAULT_MESH_NAME, hidden=True
         )
         mesh.description = default_desc
         mesh.preview = f"models/{mesh_ID}/{mesh_ID}_prev.jpg"
@@ -78,7 +78,7 @@ def post_save_mesh(sender, instance, **kwargs):
     Creates corresponding directories in filesystem
 
     """
-    mesh_ID = instance.ID
+    mesh_ID = instance.slug
 
     # Create these folders in MEDIA, if they don't exist
     to_create = ["images", "images/nsfw", "images/good", "images/bad"]
@@ -95,7 +95,7 @@ def post_save_mesh(sender, instance, **kwargs):
         if not static_path.exists():
             static_path.mkdir(parents=True)  # Makes both cache & mesh_ID folders
 
-    # LATE_EXP: if mesh.status == "Live", then:
+    # LATE_EXP: if mesh.status == MeshStatus.LIVE, then:
     # 1. Create preview image
     # 2. Assign it to mesh.preview
     # FIXME: Do this per `Run` instead.
@@ -107,7 +107,7 @@ def post_del_mesh(sender, instance, **kwargs):
     Deletes corresponding directories from filesystem post Mesh deletion.
 
     """
-    mesh_ID = instance.ID
+    mesh_ID = instance.slug
     src = MEDIA / f"models/{mesh_ID}"
     dest = STATIC / f"models/{mesh_ID}"
 
@@ -135,7 +135,7 @@ def pre_save_image(sender, instance, **kwargs):
         old_instance = Image.objects.get(pk=instance.pk)
 
         if instance.label != old_instance.label:
-            image_root = f"models/{instance.contribution.mesh.ID}/images/"
+            image_root = f"models/{instance.contribution.mesh.slug}/images/"
             src = MEDIA / instance.image.name
             fname = instance.image.name.split("/")[-1]
             if not instance.label:
@@ -171,5 +171,5 @@ def post_del_run(sender, instance, **kwargs):
 
     # Delete only if the run is not archived
     # NOTE: These runs had succeeded, so ARKs were generated. Have to keep them.
-    if run_dir.exists() and instance.status != "Archived":
+    if run_dir.exists() and instance.status != RunStatus.ARCHIVED:
         shutil.rmtree(run_dir)
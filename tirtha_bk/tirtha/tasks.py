@@ -1,9 +1,22 @@
+import os
 from pathlib import Path
 
 from django.conf import settings
 
+# NOTE: Install `pillow-simd` (built against libjpeg-turbo) in place of `Pillow` for
+# SIMD resampling & JPEG codecs. It is a drop-in replacement, so the import is the same.
+from PIL import ExifTags
+from PIL import Image as PILImage
+from PIL import ImageOps
+
+try:
+    # NOTE: Optional - Needs libvips. Falls back to PIL if not available.
+    import pyvips
+except (ImportError, OSError):
+    pyvips = None
+
 # Local imports
-from tirtha.models import Contributor
+from tirtha.models import Contributor, Mesh
 
 from .celery import app, crontab, get_task_logger
 from .utils import Logger
@@ -15,6 +28,95 @@ BACKUP_INTERVAL = crontab(minute=0, hour=0)  # Every 24 hours at 00:00
 DBCLEANUP_INTERVAL = crontab(
     minute=0, hour=0, day_of_week=0
 )  # Every 1 week at 00:00 on Sunday
+THUMBNAIL_MIN_DIMENSION = 400  # px - Shortest side of the resized thumbnail
+
+
+@app.task
+def resize_thumbnail(mesh_slug):
+    """
+    Resizes & compresses the thumbnail, when a `Mesh` is saved with a new thumbnail.
+
+    """
+    mesh = Mesh.objects.get(slug=mesh_slug)
+    if not mesh.thumbnail:
+        return
+
+    cel_logger.info(f"resize_thumbnail: Resizing thumbnail for mesh: {mesh_slug}...")
+    if pyvips is not None:
+        # libvips streams the image through decode -> resize -> encode (with shrink-on-load),
+        # without holding the full-resolution image in memory
+        path = Path(mesh.thumbnail.path)
+        header = pyvips.Image.new_from_file(str(path))
+        width, height = header.width, header.height
+        if header.get_typeof("orientation") and header.get("orientation") > 4:
+            width, height = height, width  # EXIF rotation by 90 / 270 degrees
+        # Scale the shortest side down to THUMBNAIL_MIN_DIMENSION. `size="down"` never upscales.
+        unbounded = 10_000_000
+        if width > height:  # Landscape
+            box = (unbounded, THUMBNAIL_MIN_DIMENSION)
+        else:  # Portrait
+            box = (THUMBNAIL_MIN_DIMENSION, unbounded)
+
+        # Write to a temporary file (same suffix, so libvips picks the same format) & swap atomically
+        tmp_path = path.with_name(f"{path.stem}.tmp{path.suffix}")
+        thumb = pyvips.Image.thumbnail(str(path), box[0], height=box[1], size="down")
+        thumb.write_to_file(str(tmp_path), Q=60, strip=True)
+        os.replace(tmp_path, path)
+    else:
+        min_dimension = THUMBNAIL_MIN_DIMENSION
+
+        # Load the uploaded image
+        # NOTE: Context managers release the file handle & pixel buffers as soon as each
+        # image is done with, rather than whenever they get garbage collected.
+        with PILImage.open(mesh.thumbnail.path) as source:
+            # Shrink-on-load for JPEGs - libjpeg decodes at 1/2, 1/4 or 1/8 scale, while keeping
+            # both sides >= 2 * min_dimension, so `resize()` still has enough pixels to work with.
+            # NOTE: No-op for other formats.
+            source.draft("RGB", (min_dimension * 2, min_dimension * 2))
+            # NOTE: Read before `exif_transpose()`, which returns a copy
+            source_format = source.format
+            orientation = source.getexif().get(ExifTags.Base.Orientation, 1)
+            source.load()
+            image = ImageOps.exif_transpose(source)
+
+        with image:
+            aspect_ratio = image.width / image.height
+            new_width = image.width
+            new_height = image.height
+
+            if image.width >= min_dimension and image.height >= min_dimension:
+                # Preserve aspect ratio
+                if aspect_ratio > 1:  # Landscape
+                    new_width = max(min_dimension, int(min_dimension * aspect_ratio))
+                    new_height = min_dimension
+                else:  # Portrait
+                    new_width = min_dimension
+                    new_height = max(min_dimension, int(min_dimension / aspect_ratio))
+
+            # Skip re-encoding upright images that are already small enough & already in the
+            # format `save()` would pick from the extension (the thumbnail is stored as `.png`)
+            target_format = PILImage.registered_extensions().get(
+                Path(mesh.thumbnail.path).suffix.lower()
+            )
+            if (
+                (new_width, new_height) == image.size
+                and source_format == target_format
+                and orientation == 1
+            ):
+                cel_logger.info(
+                    f"resize_thumbnail: Thumbnail for mesh: {mesh_slug} is already small enough. Skipping."
+                )
+                return
+
+            # Resize
+            with image.resize(
+                (new_width, new_height), PILImage.Resampling.LANCZOS, reducing_gap=3.0
+            ) as resized_image:
+                # Save the resized image at 60% quality
+                resized_image.save(
+                    mesh.thumbnail.path, quality=60, optimize=True, progressive=True
+                )
+    cel_logger.info(f"resize_thumbnail: Resized thumbnail for mesh: {mesh_slug}.")
 
 
 @app.task
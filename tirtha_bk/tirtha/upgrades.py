@@ -0,0 +1,298 @@
+"""
+Hand-written migration operations for upgrading existing databases
+
+The repo does not ship migrations (`build.sh` generates them with `makemigrations`), but
+some model changes cannot be auto-generated against existing data. For those,
+`manage.py upgrade_schema` writes migrations using the operations below on top of the
+existing migrations. NOTE: Run it before `makemigrations`.
+
+"""
+import shortuuid.django_fields
+from django.core.management.color import no_style
+from django.db import migrations, models
+from django.db.models import OuterRef, Subquery
+
+# NOTE: Frozen copies of `MeshStatus` & `RunStatus` - Migrations must not depend on the current models
+MESH_STATUSES = {"Pending": 0, "Processing": 1, "Live": 2, "Error": 3}
+RUN_STATUSES = {"Processing": 0, "Error": 1, "Archived": 2}
+
+
+def _map_statuses(model_name: str, statuses: dict, reverse: bool = False):
+    """
+    Returns a `RunPython` function that rewrites status labels as digit strings
+    (or back, if `reverse`), so that the column can be cast to / from an integer
+
+    """
+
+    def _map(apps, schema_editor):
+        model = apps.get_model("tirtha", model_name)
+        for label, value in statuses.items():
+            old, new = (str(value), label) if reverse else (label, str(value))
+            model.objects.filter(status=old).update(status=new)
+
+        if not reverse:
+            known = [str(value) for value in statuses.values()]
+            unknown = set(
+                model.objects.exclude(status__in=known).values_list("status", flat=True)
+            )
+            if unknown:
+                raise ValueError(
+                    f"Unknown {model_name} status(es): {sorted(unknown)}. Expected one of {list(statuses)}."
+                )
+
+    return _map
+
+
+def _status_operations(model_name: str, statuses: dict):
+    return [
+        migrations.RunPython(
+            _map_statuses(model_name, statuses),
+            _map_statuses(model_name, statuses, reverse=True),
+        ),
+        migrations.AlterField(
+            model_name=model_name,
+            name="status",
+            field=models.PositiveSmallIntegerField(
+                choices=[(value, label) for label, value in statuses.items()],
+                db_index=True,
+                default=0,
+            ),
+        ),
+    ]
+
+
+def status_to_int():
+    """
+    `Mesh.status` & `Run.status`: Status labels -> `PositiveSmallIntegerField`
+
+    """
+    return [
+        *_status_operations("mesh", MESH_STATUSES),
+        *_status_operations("run", RUN_STATUSES),
+    ]
+
+
+def needs_status_to_int(state) -> bool:
+    return isinstance(state.models["tirtha", "mesh"].fields["status"], models.CharField)
+
+
+def _number_rows(model_name: str):
+    """
+    Returns a `RunPython` function that numbers the rows of a model (in creation order) in `new_id`
+
+    """
+
+    def _number(apps, schema_editor):
+        model = apps.get_model("tirtha", model_name)
+        order = "started_at" if model_name == "run" else "created_at"
+        objs = list(model.objects.order_by(order, "ID"))
+        for new_id, obj in enumerate(objs, start=1):
+            obj.new_id = new_id
+        model.objects.bulk_update(objs, ["new_id"], batch_size=500)
+
+    return _number
+
+
+def _copy_fk(model_name: str, to_model_name: str):
+    """
+    Returns a `RunPython` function that copies the `new_id` of the referenced rows into `<fk>_new`
+
+    """
+
+    def _copy(apps, schema_editor):
+        model = apps.get_model("tirtha", model_name)
+        to_model = apps.get_model("tirtha", to_model_name)
+        model.objects.update(
+            **{
+                f"{to_model_name}_new": Subquery(
+                    to_model.objects.filter(pk=OuterRef(f"{to_model_name}_id")).values(
+                        "new_id"
+                    )
+                )
+            }
+        )
+
+    return _copy
+
+
+def _finish_pk_swap(model_name: str):
+    """
+    Returns a `RunPython` function that moves the PK sequence past the existing rows &
+    gives the `LIKE` index of `slug` the name Django expects
+
+    """
+
+    def _finish(apps, schema_editor):
+        model = apps.get_model("tirtha", model_name)
+        connection = schema_editor.connection
+        for sql in connection.ops.sequence_reset_sql(no_style(), [model]):
+            schema_editor.execute(sql)
+
+        if connection.vendor == "postgresql":
+            table = model._meta.db_table
+            old, new = (
+                schema_editor._create_index_name(table, [column], suffix="_like")
+                for column in ("ID", "slug")
+            )
+            schema_editor.execute(
+                f"ALTER INDEX IF EXISTS {schema_editor.quote_name(old)} RENAME TO {schema_editor.quote_name(new)}"
+            )
+
+    return _finish
+
+
+def _check_constraints_immediately(apps, schema_editor):
+    # NOTE: Else PostgreSQL refuses to `ALTER TABLE` after `UPDATE`s in the same
+    # transaction, due to the pending (deferred) FK checks
+    if schema_editor.connection.vendor == "postgresql":
+        schema_editor.execute("SET CONSTRAINTS ALL IMMEDIATE")
+
+
+def _stash_run_links(apps, schema_editor):
+    Run = apps.get_model("tirtha", "Run")
+    runs = list(Run.objects.prefetch_related("contributors", "images"))
+    for run in runs:
+        run.links = {
+            "contributors": [str(obj.pk) for obj in run.contributors.all()],
+            "images": [str(obj.pk) for obj in run.images.all()],
+        }
+    Run.objects.bulk_update(runs, ["links"], batch_size=500)
+
+
+def _restore_run_links(apps, schema_editor):
+    Run = apps.get_model("tirtha", "Run")
+    for field_name, fk_name in (("contributors", "contributor"), ("images", "image")):
+        through = Run._meta.get_field(field_name).remote_field.through
+        through.objects.bulk_create(
+            [
+                through(run_id=run_id, **{f"{fk_name}_id": pk})
+                for run_id, links in Run.objects.values_list("id", "links")
+                for pk in links[field_name]
+            ],
+            batch_size=500,
+        )
+
+
+def _swap_pk(model_name: str, verbose_name: str):
+    """
+    Makes the (numbered) `new_id` the PK & turns the old short UUID PK, `ID`, into `slug`
+
+    """
+    return [
+        migrations.AlterField(
+            model_name=model_name,
+            name="ID",
+            field=shortuuid.django_fields.ShortUUIDField(
+                alphabet=None,
+                length=16,
+                max_length=16,
+                prefix="",
+                unique=True,
+                verbose_name=verbose_name,
+            ),
+        ),
+        migrations.AlterField(
+            model_name=model_name,
+            name="new_id",
+            field=models.BigAutoField(primary_key=True, serialize=False),
+        ),
+        migrations.RenameField(model_name=model_name, old_name="ID", new_name="slug"),
+        migrations.RenameField(model_name=model_name, old_name="new_id", new_name="id"),
+        migrations.RunPython(_finish_pk_swap(model_name)),
+    ]
+
+
+def integer_pks():
+    """
+    `Mesh` & `Run`: Short UUID PKs (`ID`) -> `BigAutoField` PKs (`id`) + unique `slug`
+    Existing rows are numbered in creation order & all FKs / M2M tables are repointed.
+    NOTE: Irreversible - Back up the DB (`manage.py dbbackup`) first.
+
+    """
+    fk_kwargs = dict(
+        on_delete=models.deletion.CASCADE, to="tirtha.mesh", verbose_name="Mesh ID"
+    )
+    mesh_fks = [("contribution", "contributions"), ("run", "runs")]
+
+    return [
+        migrations.RunPython(_check_constraints_immediately),
+        # Mesh: Number the rows & repoint `Contribution.mesh` & `Run.mesh` via `mesh_new`
+        migrations.AddField(
+            model_name="mesh",
+            name="new_id",
+            field=models.BigIntegerField(null=True),
+        ),
+        migrations.RunPython(_number_rows("mesh")),
+        *[
+            operation
+            for model_name, _ in mesh_fks
+            for operation in (
+                migrations.AddField(
+                    model_name=model_name,
+                    name="mesh_new",
+                    field=models.BigIntegerField(null=True),
+                ),
+                migrations.RunPython(_copy_fk(model_name, "mesh")),
+                migrations.RemoveField(model_name=model_name, name="mesh"),
+            )
+        ],
+        *_swap_pk("mesh", "Mesh ID"),
+        *[
+            operation
+            for model_name, related_name in mesh_fks
+            for operation in (
+                migrations.RenameField(
+                    model_name=model_name, old_name="mesh_new", new_name="mesh"
+                ),
+                migrations.AlterField(
+                    model_name=model_name,
+                    name="mesh",
+                    field=models.ForeignKey(related_name=related_name, **fk_kwargs),
+                ),
+            )
+        ],
+        # Run: Number the rows & recreate the M2M tables, stashing the links in `links`
+        migrations.AddField(
+            model_name="run",
+            name="new_id",
+            field=models.BigIntegerField(null=True),
+        ),
+        migrations.RunPython(_number_rows("run")),
+        migrations.AddField(
+            model_name="run", name="links", field=models.JSONField(null=True)
+        ),
+        migrations.RunPython(_stash_run_links),
+        migrations.RemoveField(model_name="run", name="contributors"),
+        migrations.RemoveField(model_name="run", name="images"),
+        *_swap_pk("run", "Run ID"),
+        migrations.AddField(
+            model_name="run",
+            name="contributors",
+            field=models.ManyToManyField(
+                related_name="runs",
+                to="tirtha.contributor",
+                verbose_name="Contributors",
+            ),
+        ),
+        migrations.AddField(
+            model_name="run",
+            name="images",
+            field=models.ManyToManyField(
+                related_name="runs", to="tirtha.image", verbose_name="Images"
+            ),
+        ),
+        migrations.RunPython(_restore_run_links),
+        migrations.RemoveField(model_name="run", name="links"),
+    ]
+
+
+def needs_integer_pks(state) -> bool:
+    return "ID" in state.models["tirtha", "mesh"].fields
+
+
+# Upgrades, in the order they are applied: (name of the operations function, check)
+# `check` takes the `ProjectState` at the end of the existing migrations.
+UPGRADES = [
+    ("status_to_int", needs_status_to_int),
+    ("integer_pks", needs_integer_pks),
+]
@@ -15,7 +15,7 @@ from django.views.decorators.http import require_GET, require_POST
 # Local imports
 from tirtha_bk.views import handler403, handler404
 
-from .models import ARK, Contribution, Contributor, Image, Mesh, Run
+from .models import ARK, Contribution, Contributor, Image, Mesh, Run, RunStatus
 from .tasks import post_save_contrib_imageops
 from .utilsark import parse_ark
 
@@ -28,6 +28,7 @@ ADMIN_MAIL = settings.ADMIN_MAIL
 appConf = settings.APP_CONF
 BASE_URL = settings.BASE_URL
 FALLBACK_ARK_RESOLVER = settings.FALLBACK_ARK_RESOLVER
+UPLOAD_BATCH_SIZE = 500  # Images per INSERT in `upload()`
 
 # oauth app setup
 oauth = OAuth()
@@ -84,9 +85,9 @@ def index(request, vid=None, runid=None):
     """
     if runid is not None:
         try:
-            run = Run.objects.get(ID=runid)
+            run = Run.objects.get(slug=runid)
             runs_arks = list(
-                run.mesh.runs.filter(status="Archived")
+                run.mesh.runs.filter(status=RunStatus.ARCHIVED)
                 .order_by("-ended_at")
                 .values_list("ark", flat=True)
             )
@@ -106,7 +107,7 @@ def index(request, vid=None, runid=None):
 
     elif runid is None:
         if vid is None:
-            mesh = Mesh.objects.get(ID=settings.DEFAULT_MESH_ID)
+            mesh = Mesh.objects.get(slug=settings.DEFAULT_MESH_ID)
         else:
             try:
                 mesh = Mesh.objects.get(verbose_id=vid)
@@ -122,16 +123,16 @@ def index(request, vid=None, runid=None):
                     contribution__mesh=mesh
                 ).count(),
                 "orientation": f"{mesh.rotaZ}deg {mesh.rotaX}deg {mesh.rotaY}deg",
-                "src": f"static/models/{mesh.ID}/published/{mesh.ID}__default.glb",
+                "src": f"static/models/{mesh.slug}/published/{mesh.slug}__default.glb",
             }
         )
 
         # Check and add run info
         try:
             # Check if a run exists for the mesh
-            run = mesh.runs.filter(status="Archived").latest("ended_at")
+            run = mesh.runs.filter(status=RunStatus.ARCHIVED).latest("ended_at")
             runs_arks = list(
-                mesh.runs.filter(status="Archived")
+                mesh.runs.filter(status=RunStatus.ARCHIVED)
                 .order_by("-ended_at")
                 .values_list("ark", flat=True)
             )
@@ -284,13 +285,13 @@ def loadMesh(request):
     try:
         mesh = Mesh.objects.get(verbose_id=vid)
         runs_arks = list(
-            mesh.runs.filter(status="Archived")
+            mesh.runs.filter(status=RunStatus.ARCHIVED)
             .order_by("-ended_at")
             .values_list("ark", flat=True)
         )
-        # Get latest successful run for mesh (among Run.status == "Archived")
+        # Get latest successful run for mesh (among Run.status == RunStatus.ARCHIVED)
         try:
-            run = mesh.runs.filter(status="Archived").latest("ended_at")
+            run = mesh.runs.filter(status=RunStatus.ARCHIVED).latest("ended_at")
         except Run.DoesNotExist:
             run = None
 
@@ -299,11 +300,11 @@ def loadMesh(request):
         data = {
             "status": "Mesh found!",
             "mesh": {
-                "status": mesh.status,
+                "status": mesh.get_status_display(),
                 "has_run": True if run else False,
                 "src": run.ark.url
                 if run
-                else PRE_URL + f"static/models/{mesh.ID}/published/{mesh.ID}__default.glb",
+                else PRE_URL + f"static/models/{mesh.slug}/published/{mesh.slug}__default.glb",
                 "prev_url": mesh.preview.url,
                 "name": mesh.name,
                 "desc": mesh.description,
@@ -364,7 +365,7 @@ def loadRun(request):
                 "run_ark": f"{run.ark}",
                 "run_ark_url": f"{BASE_URL}/{run.ark}",
                 "mesh_name": run.mesh.name,
-                "runid": run.ID,
+                "runid": run.slug,
             },
         }
 
@@ -445,10 +446,10 @@ def upload(request):
     images = request.FILES.getlist("images")
     image_objs = [Image(image=image, contribution=contribution) for image in images]
     # NOTE: bulk_create() is faster than creating one-by-one and does not trigger signals
+    # NOTE: IDs are generated client-side (uuid4), so no RETURNING is needed for the PKs
     # LATE_EXP: Test abulk_create() (async) for performance improvements
-    Image.objects.bulk_create(image_objs)
-    contribution.save()
-    mesh.save()  # Updates mesh.updated_at
+    Image.objects.bulk_create(image_objs, batch_size=UPLOAD_BATCH_SIZE)
+    mesh.save(update_fields=["updated_at"])  # Updates mesh.updated_at
     post_save_contrib_imageops.delay(
         str(contribution.ID)
     )  # Send signal to trigger ImageOps
@@ -499,6 +500,6 @@ def resolveARK(request, ark: str):
     try:
         # Try to find the ARK in the database
         ark = ARK.objects.get(ark=f"{naan}/{assigned_name}")
-        return redirect("indexMesh", vid=ark.run.mesh.verbose_id, runid=ark.run.ID)
+        return redirect("indexMesh", vid=ark.run.mesh.verbose_id, runid=ark.run.slug)
     except ARK.DoesNotExist as e:
         return redirect(f"{FALLBACK_ARK_RESOLVER}/{ark}")
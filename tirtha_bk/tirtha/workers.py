@@ -1,6 +1,7 @@
 import json
 import os
 import shutil
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 from pathlib import Path
 from subprocess import STDOUT, CalledProcessError, check_output
@@ -10,7 +11,7 @@ from typing import Optional
 import cv2
 import pytz
 from django.conf import settings
-from django.db import IntegrityError
+from django.db import IntegrityError, connection
 from django.utils import timezone
 # from nn_models.MANIQA.batch_predict import MANIQAScore  # Local import # FIXME: TODO: Uncomment once fixed.
 # from nsfw_detector import predict  # Local package installation # FIXME: TODO: Uncomment once fixed.
@@ -24,7 +25,16 @@ from silence_tensorflow import silence_tensorflow  # To suppress TF warnings
 # silence_tensorflow()  # To suppress TF warnings
 
 # Local imports
-from tirtha.models import ARK, Contribution, Image, Mesh, Run
+from tirtha.models import (
+    ARK,
+    ARK_COMMITMENT,
+    Contribution,
+    Image,
+    Mesh,
+    MeshStatus,
+    Run,
+    RunStatus,
+)
 
 from .alicevision import AliceVision
 from .utils import Logger
@@ -43,6 +53,9 @@ GLTFPACK_PATH = settings.GLTFPACK_PATH
 BASE_URL = settings.BASE_URL
 ARK_NAAN = settings.ARK_NAAN
 ARK_SHOULDER = settings.ARK_SHOULDER
+# NOTE: Threads, as the per-image work is mostly DB + file I/O. Kept small, since each
+# thread holds its own DB connection & the Celery worker already runs tasks in threads.
+IMAGEOPS_MAX_WORKERS = min(4, os.cpu_count() or 1)
 
 
 class MeshOps:
@@ -57,14 +70,14 @@ class MeshOps:
 
     def __init__(self, meshID: str):
         self.meshID = meshID
-        self.mesh = mesh = Mesh.objects.get(ID=meshID)
+        self.mesh = mesh = Mesh.objects.get(slug=meshID)
         self.meshVID = mesh.verbose_id
         self.meshStr = f"{self.meshVID} <=> {self.meshID}"  # Used in logging
 
         # Create new Run
         self.run = run = Run.objects.create(mesh=mesh)
         run.save()  # Creates run directory
-        self.runID = runID = run.ID
+        self.runID = runID = run.slug
 
         # Set up Logger
         self.log_path = LOG_DIR / f"MeshOps/{meshID}/"
@@ -85,7 +98,7 @@ class MeshOps:
         cls.logger.info(f"Created new Run {runID} for mesh {self.meshStr}.")
         cls.logger.info(f"Run directory: {self.runDir}")
         cls.logger.info(f"Run log file: {cls.logger._log_file}")
-        self._update_mesh_status("Processing")
+        self._update_mesh_status(MeshStatus.PROCESSING)
 
         # Use image filenames (UUIDs in DB) to fetch images & corresponding contributors
         self.imageFiles = sorted(self.imageDir.glob("*"))
@@ -93,9 +106,11 @@ class MeshOps:
         try:
             # NOTE: This does not raise an error if the image is not found in the DB
             # CHECK: Test ain_bulk()
-            self.images = Image.objects.in_bulk(
-                self.imageUUIDs, field_name="ID"
-            ).values()
+            self.images = (
+                Image.objects.select_related("contribution__contributor")
+                .in_bulk(self.imageUUIDs, field_name="ID")
+                .values()
+            )
             self.contributions = [image.contribution for image in self.images]
             self.contributors = [
                 contribution.contributor for contribution in self.contributions
@@ -163,13 +178,13 @@ class MeshOps:
                 self.logger.error(f"Executable not found: {exe}")
                 raise FileNotFoundError(f"Executable not found: {exe}")
 
-    def _update_mesh_status(self, status: str):
+    def _update_mesh_status(self, status: MeshStatus):
         """
         Updates the mesh status in the DB
 
         Parameters
         ----------
-        status : str
+        status : MeshStatus
             The status to update the mesh to
 
         """
@@ -177,22 +192,24 @@ class MeshOps:
         self.mesh.status = status
         self.mesh.save()  # NOTE: Consider the effect on signals.py when saving Mesh or any other model
         self.logger.info(
-            f"Updated mesh.status to '{status}' for mesh {self.meshStr}..."
+            f"Updated mesh.status to '{status.label}' for mesh {self.meshStr}..."
         )
 
-    def _update_run_status(self, status: str):
+    def _update_run_status(self, status: RunStatus):
         """
         Updates the run status in the DB
 
         Parameters
         ----------
-        status : str
+        status : RunStatus
             The status to update the run to
 
         """
         self.run.status = status
         self.run.save()
-        self.logger.info(f"Updated run.status to '{status}' for run {self.runID}...")
+        self.logger.info(
+            f"Updated run.status to '{status.label}' for run {self.runID}..."
+        )
 
     def _handle_error(self, excep: Exception, caller: str):
         """
@@ -211,10 +228,10 @@ class MeshOps:
         self.logger.error(f"{excep}", exc_info=True)
 
         # Update statuses to 'Error'
-        self._update_mesh_status("Error")
+        self._update_mesh_status(MeshStatus.ERROR)
         self.run.ended_at = timezone.now()
         self.run.save()
-        self._update_run_status("Error")
+        self._update_run_status(RunStatus.ERROR)
 
         raise excep
 
@@ -278,7 +295,7 @@ class MeshOps:
                 input_dir=self.imageDir,
                 cache_dir=self.runDir,
                 # If a prior run had errored out, set the current run to produce full tracebacks
-                verboseLevel="trace" if mesh.status == "Error" else "info",
+                verboseLevel="trace" if mesh.status == MeshStatus.ERROR else "info",
                 logger=MeshOps.av_logger,
             )
         except Exception as e:
@@ -439,18 +456,18 @@ class MeshOps:
             self.logger.info(
                 f"Looking up & deleting errored-out runs for mesh {meshStr}..."
             )
-            runs = Run.objects.filter(mesh=self.mesh, status="Error").order_by(
+            runs = Run.objects.filter(mesh=self.mesh, status=RunStatus.ERROR).order_by(
                 "-ended_at"
             )
             if len(runs) > 0:
                 for run in runs:
                     runDir = STATIC / "models" / Path(run.directory)
                     self.logger.info(
-                        f"Run {run.ID} for mesh {meshStr} has errors. Deleting..."
+                        f"Run {run.slug} for mesh {meshStr} has errors. Deleting..."
                     )
                     shutil.rmtree(runDir)  # Delete folder
                     run.delete()  # Delete from DB
-                    self.logger.info(f"Deleted run {run.ID} for mesh {meshStr}.")
+                    self.logger.info(f"Deleted run {run.slug} for mesh {meshStr}.")
             self.logger.info(
                 f"Deleted {len(runs)} errored-out runs for mesh {meshStr}."
             )
@@ -471,7 +488,7 @@ class MeshOps:
             )
             shutil.move(self.runDir, arcDir)  # Move run folder to archive
             self.run.directory = str(arcDir)  # Update run directory
-            self._update_run_status("Archived")  # Update run status & save
+            self._update_run_status(RunStatus.ARCHIVED)  # Update run status & save
             self.logger.info(
                 f"Archived run {curr_runID} for mesh {meshStr} to {arcDir}."
             )
@@ -498,14 +515,8 @@ class MeshOps:
 
         # Create metadata
         self.logger.info(
-            f"Creating metadata for ARK for run {run.ID} for mesh {meshStr}..."
-        )
-        def_commit = (
-            "This ARK was generated & is managed by Project Tirtha (https://smlab.niser.ac.in/project/tirtha/). "
-            + "We are committed to maintaining this ARK as per our Terms of Use (https://smlab.niser.ac.in/project/tirtha/#terms) "
-            + "and Privacy Policy (https://smlab.niser.ac.in/project/tirtha/#privacy)."
+            f"Creating metadata for ARK for run {run.slug} for mesh {meshStr}..."
         )
-
         metadata = {
             "monument": {
                 "name": str(mesh.name),
@@ -516,20 +527,20 @@ class MeshOps:
                 "completed": True if mesh.completed else False,
             },
             "run": {
-                "ID": str(run.ID),
+                "ID": str(run.slug),
                 "ended_at": str(run.ended_at),
                 "contributors": list(run.contributors.values_list("name", flat=True)),
                 "images": int(run.images.count()),
             },
-            "notice": def_commit,
+            "notice": ARK_COMMITMENT,
         }
         metadata_json = json.dumps(metadata)
         self.logger.info(
-            f"Created metadata for ARK for run {run.ID} for mesh {meshStr}..."
+            f"Created metadata for ARK for run {run.slug} for mesh {meshStr}..."
         )
 
         # Generate ark - NOTE: Adapted from arklet
-        self.logger.info(f"Generating ARK for run {run.ID} for mesh {meshStr}...")
+        self.logger.info(f"Generating ARK for run {run.slug} for mesh {meshStr}...")
         ark, collisions = None, 0
         while True:
             noid = generate_noid(ark_len)
@@ -550,7 +561,7 @@ class MeshOps:
             except IntegrityError:
                 collisions += 1
                 continue
-        msg = f"Generated ARK for run {run.ID} for mesh {meshStr} after {collisions} collision(s)."
+        msg = f"Generated ARK for run {run.slug} for mesh {meshStr} after {collisions} collision(s)."
         if collisions == 0:
             self.logger.info(msg)
         else:
@@ -569,7 +580,7 @@ class MeshOps:
         self.logger.info(f"Finalizing run {self.runID} for mesh {self.meshStr}.")
         self.mesh.reconstructed_at = datetime.now(pytz.timezone("Asia/Kolkata"))
         self.logger.info(f"Run {self.runID} finished for mesh {self.meshStr}.")
-        self._update_mesh_status("Live")
+        self._update_mesh_status(MeshStatus.LIVE)
         self.logger.info(
             f"Finished finalizing run {self.runID} for mesh {self.meshStr}."
         )
@@ -658,88 +669,115 @@ class ImageOps:
 
         return True if pos > self.thresholds["CS"] else False
 
-    def check_images(self):
+    def _update_image(self, img: Image, label: str, remark: str):
         """
-        Checks images for NSFW content & quality and sorts them into
-        `images/[good / bad]` folders.
-        NOTE: No sRGB linearization is done here, as decision boundaries
-        or thresholds are hard to delineate in linear sRGB space.
+        Updates the label & remark of 1 image
 
         """
         lg = self.logger
-        
-        # FIXME: TODO: Till the VRAM + concurrency issue is fixed, skip image checks.
-        # FIXME: TODO: Remove once fixed.
-        lg.info(f"NOTE: Skipping image checks for contribution {self.contribution.ID} due to VRAM + concurrency issues. FIXME:")
+        lg.info(f"Updating image {img.ID} with label {label} and remark {remark}.")
+        img.label = label
+        img.remark = remark
+        img.save()  # `pre_save`` signal handles moving file to the correct folder
+        lg.info(f"Updated image {img.ID} with label {label} and remark {remark}.")
 
-        def _update_image(img, label, remark):
-            lg.info(f"Updating image {img.ID} with label {label} and remark {remark}.")
-            img.label = label
-            img.remark = remark
-            img.save()  # `pre_save`` signal handles moving file to the correct folder
-            lg.info(f"Updated image {img.ID} with label {label} and remark {remark}.")
+    def _check_image(self, idx: int, img: Image):
+        """
+        Checks 1 image for NSFW content & quality and labels it
 
-        # manr = MANIQAScore(ckpt_pth=MANIQA_MODEL_FILEPATH, cpu_num=32, num_crops=20)
-        # FIXME: TODO: Uncomment once fixed.
-        for idx, img in enumerate(self.images):
-            lg.info(f"Checking image {img.ID} | [{idx}/{self.size}]...")
-            # img_path = str((MEDIA / img.image.name).resolve()) # FIXME: TODO: Uncomment once fixed.
+        """
+        lg = self.logger
+        lg.info(f"Checking image {img.ID} | [{idx}/{self.size}]...")
+        # img_path = str((MEDIA / img.image.name).resolve()) # FIXME: TODO: Uncomment once fixed.
+
+        # FIXME: TODO: Remove (till `return`) once fixed
+        # Skip & move image to good folder
+        self._update_image(img, "good", f"PASS -- SKIPPED")
+        return
+
+        # Content safety check
+        if not self.check_content_safety(img_path):
+            self._update_image(
+                img, "nsfw", "NSFW content detected by local NSFW filter."
+            )
+            return
+
+        # Quality check
+        rgb_img = cv2.imread(img_path, cv2.IMREAD_COLOR)
+        gray_img = cv2.cvtColor(rgb_img, cv2.COLOR_BGR2GRAY)
+        # DR
+        dr = (gray_img.max() - gray_img.min()) * 100 / 255
+        if dr < self.thresholds["DR"]:
+            self._update_image(
+                img,
+                "bad",
+                f"FAIL -- DR: {dr:.4f}; Rejected by DR threshold: {self.thresholds['DR']}.",
+            )
+            return
 
-            # FIXME: TODO: Remove (till `continue`) once fixed
-            # Skip & move image to good folder
-            _update_image(
+        # CNR
+        cnr = gray_img.std() ** 2 / gray_img.mean()
+        if cnr < self.thresholds["CNR"]:
+            self._update_image(
                 img,
-                "good",
-                f"PASS -- SKIPPED"
+                "bad",
+                f"FAIL -- DR: {dr:.4f}, CNR: {cnr:.4f}; Rejected by CNR threshold: {self.thresholds['CNR']}.",
             )
-            continue
+            return
 
-            # Content safety check
-            if not self.check_content_safety(img_path):
-                _update_image(
-                    img, "nsfw", "NSFW content detected by local NSFW filter."
-                )
-                continue
+        # MANIQA
+        iqa_score = float(self.manr.predict_one(img_path).detach().cpu().numpy())
+        if iqa_score < self.thresholds["MANIQA"]:
+            self._update_image(
+                img,
+                "bad",
+                f"FAIL -- DR: {dr:.4f}, CNR: {cnr:.4f}, MANIQA: {iqa_score:.4f}; Rejected by MANIQA threshold: {self.thresholds['MANIQA']}.",
+            )
+            return
 
-            # Quality check
-            rgb_img = cv2.imread(img_path, cv2.IMREAD_COLOR)
-            gray_img = cv2.cvtColor(rgb_img, cv2.COLOR_BGR2GRAY)
-            # DR
-            dr = (gray_img.max() - gray_img.min()) * 100 / 255
-            if dr < self.thresholds["DR"]:
-                _update_image(
-                    img,
-                    "bad",
-                    f"FAIL -- DR: {dr:.4f}; Rejected by DR threshold: {self.thresholds['DR']}.",
-                )
-                continue
+        # If all pass, add dr, cnr, iqa_score as a remark to Image & move to good folder
+        self._update_image(
+            img,
+            "good",
+            f"PASS -- DR: {dr:.4f}, CNR: {cnr:.4f}, MANIQA: {iqa_score:.4f}; Thresholds: {self.thresholds}.",
+        )
 
-            # CNR
-            cnr = gray_img.std() ** 2 / gray_img.mean()
-            if cnr < self.thresholds["CNR"]:
-                _update_image(
-                    img,
-                    "bad",
-                    f"FAIL -- DR: {dr:.4f}, CNR: {cnr:.4f}; Rejected by CNR threshold: {self.thresholds['CNR']}.",
-                )
-                continue
+    def _check_chunk(self, chunk: list):
+        """
+        Checks a chunk of `(idx, img)` pairs in a worker thread
 
-            # MANIQA
-            iqa_score = float(manr.predict_one(img_path).detach().cpu().numpy())
-            if iqa_score < self.thresholds["MANIQA"]:
-                _update_image(
-                    img,
-                    "bad",
-                    f"FAIL -- DR: {dr:.4f}, CNR: {cnr:.4f}, MANIQA: {iqa_score:.4f}; Rejected by MANIQA threshold: {self.thresholds['MANIQA']}.",
-                )
-                continue
+        """
+        try:
+            for idx, img in chunk:
+                self._check_image(idx, img)
+        finally:
+            connection.close()  # NOTE: Each thread opens its own DB connection
 
-            # If all pass, add dr, cnr, iqa_score as a remark to Image & move to good folder
-            _update_image(
-                img,
-                "good",
-                f"PASS -- DR: {dr:.4f}, CNR: {cnr:.4f}, MANIQA: {iqa_score:.4f}; Thresholds: {self.thresholds}.",
-            )
+    def check_images(self):
+        """
+        Checks images for NSFW content & quality and sorts them into
+        `images/[good / bad]` folders.
+        NOTE: No sRGB linearization is done here, as decision boundaries
+        or thresholds are hard to delineate in linear sRGB space.
+
+        """
+        lg = self.logger
+
+        # FIXME: TODO: Till the VRAM + concurrency issue is fixed, skip image checks.
+        # FIXME: TODO: Remove once fixed.
+        lg.info(
+            f"NOTE: Skipping image checks for contribution {self.contribution.ID} due to VRAM + concurrency issues. FIXME:"
+        )
+
+        # self.manr = MANIQAScore(ckpt_pth=MANIQA_MODEL_FILEPATH, cpu_num=32, num_crops=20)
+        # FIXME: TODO: Uncomment once fixed.
+        images = list(enumerate(self.images))
+        workers = min(IMAGEOPS_MAX_WORKERS, self.size)
+        chunks = [images[i::workers] for i in range(workers)]
+        lg.info(f"Checking {self.size} images using {workers} worker threads...")
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            # NOTE: Blocking call; `list()` re-raises any exception from the workers
+            list(executor.map(self._check_chunk, chunks))
 
         lg.info(f"Finished checking images for contribution {self.contribution.ID}.")
         lg.info("Marking contribution as `processed` & updating `processed_at`.")
@@ -758,12 +796,12 @@ Tasks
 def prerun_check(contrib_id):
     contrib = Contribution.objects.get(ID=contrib_id)
     mesh = contrib.mesh
-    images_count = len(os.listdir(MEDIA / f"models/{mesh.ID}/images/good"))
+    images_count = len(os.listdir(MEDIA / f"models/{mesh.slug}/images/good"))
 
     # Check if mesh is already being processed or completed
     if mesh.completed:
         return False, "Mesh already completed."
-    if mesh.status == "Processing":
+    if mesh.status == MeshStatus.PROCESSING:
         return False, "Mesh already processing."
     if images_count < MESHOPS_MIN_IMAGES:
         return (
@@ -782,7 +820,7 @@ def mo_runner(contrib_id: str):
 
     """
     contrib = Contribution.objects.get(ID=contrib_id)
-    meshID = str(contrib.mesh.ID)
+    meshID = str(contrib.mesh.slug)
     meshVID = str(contrib.mesh.verbose_id)
 
     cons = Console()  # This appears as normal printed logs in celery logs.
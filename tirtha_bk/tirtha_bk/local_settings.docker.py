@@ -78,6 +78,8 @@ DB_PWD = os.getenv("DB_PWD", "docker")  # CHANGEME:
 DB_HOST = os.getenv("DB_HOST", "db")  # CHANGEME:
 DB_PORT = os.getenv("DB_PORT", "5432")
 
+# NOTE: Use PostgreSQL. The `UUIDField` PKs (`Contributor`, `Contribution` & `Image`) are
+# stored as the native 16-byte `uuid` type there, but fall back to CHAR(32) on MySQL / SQLite.
 DATABASES = {
     "default": {
         "ENGINE": "django.db.backends.postgresql",
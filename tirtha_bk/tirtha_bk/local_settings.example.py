@@ -73,6 +73,8 @@ DB_PWD = "<your_db_pwd>"  # CHANGEME:
 DB_HOST = "localhost"
 DB_PORT = ""
 
+# NOTE: Use PostgreSQL. The `UUIDField` PKs (`Contributor`, `Contribution` & `Image`) are
+# stored as the native 16-byte `uuid` type there, but fall back to CHAR(32) on MySQL / SQLite.
 DATABASES = {
     "default": {
         "ENGINE": "django.db.backends.postgresql",